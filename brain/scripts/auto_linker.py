@@ -7,6 +7,7 @@ Provides AutoLinker for automatic link generation and LinkGraph for fast travers
 
 import json
 import logging
+import sys
 from collections import deque
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
@@ -14,10 +15,10 @@ from pathlib import Path
 from typing import Optional, List, Dict, Set, Any, Tuple
 
 try:
-    from .memory_store import Chunk, ChunkStore, ChunkLinks
+    from .memory_store import Chunk, ChunkStore, ChunkLinks, _json_dumps, _json_loads
 except ImportError:
     # For running directly
-    from memory_store import Chunk, ChunkStore, ChunkLinks
+    from memory_store import Chunk, ChunkStore, ChunkLinks, _json_dumps, _json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -36,78 +37,165 @@ class LinkGraph:
     Stores links as adjacency lists with link type information:
     - from -> to (link_type)
     - to -> from (f"{link_type}_reverse")
+    
+    Persistence is a JSON snapshot plus an append-only op-log next to it.
+    add_link() appends one line to the op-log; the snapshot is written on
+    the first link and rewritten (truncating the op-log) once the log
+    outgrows it.
     """
     
+    # Compact once the op-log is this many times larger than the snapshot
+    SNAPSHOT_RATIO = 4
+    # ...but never for logs smaller than this (bytes)
+    MIN_SNAPSHOT_BYTES = 64 * 1024
+    
     def __init__(self, index_path: str):
         self.index_path = Path(index_path)
+        self.oplog_path = self.index_path.with_name(self.index_path.stem + ".oplog.jsonl")
         self._forward: Dict[str, Dict[str, List[str]]] = {}  # chunk -> {link_type -> [targets]}
         self._reverse: Dict[str, Dict[str, List[str]]] = {}  # chunk -> {link_type -> [sources]}
+        # Derived (not persisted), built on first read: chunk -> ordered set of
+        # targets over all link types, grouped in link-type order
+        self._outgoing_all: Dict[str, Dict[str, None]] = {}
+        self._snapshot_bytes = 0
+        self._oplog_bytes = 0
+        self._has_snapshot = False
         self._load()
     
     def _load(self):
-        """Load link graph from disk."""
+        """Load link graph snapshot from disk and replay the op-log."""
         if self.index_path.exists():
             try:
-                data = json.loads(self.index_path.read_text(encoding="utf-8"))
-                self._forward = data.get("forward", {})
-                self._reverse = data.get("reverse", {})
+                raw = self.index_path.read_text(encoding="utf-8")
+                data = _json_loads(raw)
+                self._forward = self._intern_adjacency(data.get("forward", {}))
+                self._reverse = self._intern_adjacency(data.get("reverse", {}))
+                self._snapshot_bytes = len(raw.encode("utf-8"))
+                self._has_snapshot = True
                 logger.info(f"Loaded link graph from {self.index_path}")
             except (json.JSONDecodeError, IOError) as e:
                 logger.warning(f"Could not load link graph: {e}")
                 self._forward = {}
                 self._reverse = {}
+                self._outgoing_all = {}
+        
+        if self.oplog_path.exists():
+            try:
+                raw = self.oplog_path.read_bytes()
+                end = raw.rfind(b"\n") + 1
+                if end < len(raw):
+                    # Torn final write: cut it off so the next append starts
+                    # on a fresh line instead of being glued onto it
+                    logger.warning(f"Truncating torn op-log entry in {self.oplog_path}")
+                    with self.oplog_path.open("r+b") as f:
+                        f.truncate(end)
+                    raw = raw[:end]
+                self._oplog_bytes = len(raw)
+                for line in raw.decode("utf-8", errors="replace").splitlines():
+                    try:
+                        op = _json_loads(line)
+                        if op.get("op") == "add":
+                            self._apply_link(op["from"], op["to"], op["type"])
+                    except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+                        logger.warning(f"Skipping corrupt op-log entry in {self.oplog_path}")
+            except IOError as e:
+                logger.warning(f"Could not replay link graph op-log: {e}")
     
     def _save(self):
-        """Persist link graph to disk."""
+        """Persist link graph snapshot to disk."""
         data = {
             "forward": self._forward,
             "reverse": self._reverse,
             "updated": datetime.utcnow().isoformat() + "Z"
         }
+        raw = _json_dumps(data)
         self.index_path.parent.mkdir(parents=True, exist_ok=True)
-        self.index_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        self.index_path.write_text(raw, encoding="utf-8")
+        self._snapshot_bytes = len(raw.encode("utf-8"))
+        self._has_snapshot = True
+    
+    def _append_op(self, op: Dict[str, str]):
+        """Append a single operation to the op-log."""
+        line = _json_dumps(op, indent=None) + "\n"
+        self.oplog_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.oplog_path.open("a", encoding="utf-8") as f:
+            f.write(line)
+        self._oplog_bytes += len(line.encode("utf-8"))
+        
+        threshold = max(self.MIN_SNAPSHOT_BYTES,
+                        self.SNAPSHOT_RATIO * self._snapshot_bytes)
+        if self._oplog_bytes > threshold:
+            self.snapshot()
+    
+    def snapshot(self):
+        """Write a full snapshot and truncate the op-log."""
+        self._save()
+        if self.oplog_path.exists():
+            self.oplog_path.unlink()
+        self._oplog_bytes = 0
+    
+    @staticmethod
+    def _intern_adjacency(adjacency: Dict[str, Dict[str, List[str]]]
+                          ) -> Dict[str, Dict[str, List[str]]]:
+        """Rebuild loaded adjacency lists with interned chunk IDs."""
+        intern = sys.intern
+        return {
+            intern(chunk_id): {
+                intern(link_type): [intern(other) for other in others]
+                for link_type, others in links.items()
+            }
+            for chunk_id, links in adjacency.items()
+        }
     
-    def add_link(self, from_id: str, to_id: str, link_type: str):
+    def _apply_link(self, from_id: str, to_id: str, link_type: str) -> bool:
         """
-        Add bidirectional link.
+        Add link to the in-memory adjacency lists.
         
-        Args:
-            from_id: Source chunk ID
-            to_id: Target chunk ID
-            link_type: Type of link (context_of, follows, related_to, etc.)
+        Chunk IDs are interned so every occurrence across the forward and
+        reverse maps shares one string object (and compares by identity).
+        
+        Returns:
+            True if the link was new, False if it already existed
         """
+        from_id = sys.intern(from_id)
+        to_id = sys.intern(to_id)
+        link_type = sys.intern(link_type)
+        
         # Initialize structures if needed
-        if from_id not in self._forward:
-            self._forward[from_id] = {}
-        if to_id not in self._reverse:
-            self._reverse[to_id] = {}
+        forward = self._forward.setdefault(from_id, {})
+        reverse = self._reverse.setdefault(to_id, {})
+        # Keep an (empty) forward entry for to_id so it is a known node
+        self._forward.setdefault(to_id, {})
         
         # Add forward link: from -> to (link_type)
-        if link_type not in self._forward[from_id]:
-            self._forward[from_id][link_type] = []
-        if to_id not in self._forward[from_id][link_type]:
-            self._forward[from_id][link_type].append(to_id)
+        targets = forward.setdefault(link_type, [])
+        added = to_id not in targets
+        if added:
+            targets.append(to_id)
+            self._outgoing_all.pop(from_id, None)
         
         # Add reverse link: to -> from (link_type_reverse)
-        reverse_type = f"{link_type}_reverse"
-        if reverse_type not in self._reverse[to_id]:
-            self._reverse[to_id][reverse_type] = []
-        if from_id not in self._reverse[to_id][reverse_type]:
-            self._reverse[to_id][reverse_type].append(from_id)
-        
-        # Also update reverse lookup for from_id
-        if to_id not in self._reverse:
-            self._reverse[to_id] = {}
-        if reverse_type not in self._reverse[to_id]:
-            self._reverse[to_id][reverse_type] = []
-        if from_id not in self._reverse[to_id][reverse_type]:
-            self._reverse[to_id][reverse_type].append(from_id)
-        
-        # Also update forward lookup for to_id
-        if to_id not in self._forward:
-            self._forward[to_id] = {}
+        sources = reverse.setdefault(f"{link_type}_reverse", [])
+        if from_id not in sources:
+            sources.append(from_id)
+            added = True
         
-        self._save()
+        return added
+    
+    def add_link(self, from_id: str, to_id: str, link_type: str):
+        """
+        Add bidirectional link.
+        
+        Args:
+            from_id: Source chunk ID
+            to_id: Target chunk ID
+            link_type: Type of link (context_of, follows, related_to, etc.)
+        """
+        if self._apply_link(from_id, to_id, link_type):
+            if self._has_snapshot:
+                self._append_op({"op": "add", "from": from_id, "to": to_id, "type": link_type})
+            else:
+                self.snapshot()
         logger.debug(f"Added link: {from_id} -> {to_id} ({link_type})")
     
     def get_outgoing(self, chunk_id: str, link_type: str = None) -> List[str]:
@@ -127,11 +215,14 @@ class LinkGraph:
         if link_type:
             return self._forward[chunk_id].get(link_type, [])
         
-        # Return all outgoing links
-        result = []
-        for targets in self._forward[chunk_id].values():
-            result.extend(targets)
-        return list(set(result))  # Remove duplicates
+        # Return all outgoing links (deduplicated view, rebuilt after changes)
+        merged = self._outgoing_all.get(chunk_id)
+        if merged is None:
+            merged = dict.fromkeys(
+                target for targets in self._forward[chunk_id].values() for target in targets
+            )
+            self._outgoing_all[chunk_id] = merged
+        return list(merged)
     
     def get_incoming(self, chunk_id: str, link_type: str = None) -> List[str]:
         """
@@ -154,7 +245,7 @@ class LinkGraph:
         result = []
         for sources in self._reverse[chunk_id].values():
             result.extend(sources)
-        return list(set(result))  # Remove duplicates
+        return list(dict.fromkeys(result))  # Remove duplicates, keep order
     
     def get_links(self, chunk_id: str, link_type: str = None) -> Dict[str, List[str]]:
         """
@@ -171,6 +262,26 @@ class LinkGraph:
         
         return dict(self._forward[chunk_id])
     
+    def _neighbours(self, chunk_id: str,
+                    link_types: List[str] = None) -> List[str]:
+        """
+        Get outgoing targets, restricted to link_types when given.
+        
+        Only the requested link-type lists are read, so filtered traversal
+        does not scan every link type for every candidate target.
+        """
+        if not link_types:
+            return self.get_outgoing(chunk_id, None)
+        
+        links = self._forward.get(chunk_id)
+        if not links:
+            return []
+        
+        result = []
+        for link_type in link_types:
+            result.extend(links.get(link_type, ()))
+        return list(dict.fromkeys(result))
+    
     def traverse(self, start_id: str, max_depth: int = 3,
                  link_types: List[str] = None) -> List[str]:
         """
@@ -194,21 +305,7 @@ class LinkGraph:
             if depth >= max_depth:
                 continue
             
-            # Get outgoing links
-            outgoing = self.get_outgoing(current_id, None)
-            
-            for target_id in outgoing:
-                # Check link type filter
-                if link_types:
-                    if current_id in self._forward:
-                        valid = False
-                        for lt, targets in self._forward[current_id].items():
-                            if target_id in targets and lt in link_types:
-                                valid = True
-                                break
-                        if not valid:
-                            continue
-                
+            for target_id in self._neighbours(current_id, link_types):
                 if target_id not in visited:
                     visited.add(target_id)
                     result.append(target_id)
@@ -233,19 +330,7 @@ class LinkGraph:
         while queue:
             current_id, path = queue.popleft()
             
-            outgoing = self.get_outgoing(current_id, None)
-            
-            for target_id in outgoing:
-                if link_types:
-                    if current_id in self._forward:
-                        valid = False
-                        for lt, targets in self._forward[current_id].items():
-                            if target_id in targets and lt in link_types:
-                                valid = True
-                                break
-                        if not valid:
-                            continue
-                
+            for target_id in self._neighbours(current_id, link_types):
                 if target_id == to_id:
                     return path + [target_id]
                 
@@ -286,12 +371,11 @@ class AutoLinker:
         """
         chunk_id = new_chunk.id
         conversation_id = new_chunk.metadata.conversation_id
-        created_str = new_chunk.metadata.created
         tags = new_chunk.tags
         
         # Parse creation timestamp
         try:
-            created = datetime.fromisoformat(created_str.replace("Z", "+00:00"))
+            created = new_chunk.metadata.created_dt
         except (ValueError, AttributeError):
             logger.warning(f"Invalid created timestamp for chunk {chunk_id}")
             created = datetime.utcnow()
@@ -343,7 +427,7 @@ class AutoLinker:
         links to existing_chunk (chunk_id), we also add a link from existing_chunk
         back to new_chunk to maintain bidirectionality.
         """
-        chunk = self.chunk_store.get_chunk(chunk_id)
+        chunk = self.chunk_store._read_chunk(chunk_id)
         if chunk:
             if link_type == "context_of":
                 if target_id not in chunk.links.context_of:
@@ -360,7 +444,7 @@ class AutoLinker:
     
     def _add_related_to_link(self, target_id: str, new_chunk_id: str):
         """Add related_to link from target chunk to new chunk."""
-        chunk = self.chunk_store.get_chunk(target_id)
+        chunk = self.chunk_store._read_chunk(target_id)
         if chunk:
             if new_chunk_id not in chunk.links.related_to:
                 chunk.links.related_to.append(new_chunk_id)
@@ -445,6 +529,10 @@ def calculate_link_strength(source: Chunk, target: Chunk,
     """
     Calculate link strength based on link type and chunk attributes.
     
+    Cheap cases return before any parsing: context_of is constant and never
+    touches metadata, and related_to without tags on either side skips the
+    set intersection.
+    
     Args:
         source: Source chunk
         target: Target chunk
@@ -459,12 +547,8 @@ def calculate_link_strength(source: Chunk, target: Chunk,
     elif link_type == "follows":
         # Time-decayed strength
         try:
-            source_time = datetime.fromisoformat(
-                source.metadata.created.replace("Z", "+00:00")
-            )
-            target_time = datetime.fromisoformat(
-                target.metadata.created.replace("Z", "+00:00")
-            )
+            source_time = source.metadata.created_dt
+            target_time = target.metadata.created_dt
             time_diff = (source_time - target_time).total_seconds()
             minutes = abs(time_diff) / 60
             return max(0.3, 1.0 - (minutes / 5))
@@ -473,6 +557,8 @@ def calculate_link_strength(source: Chunk, target: Chunk,
     
     elif link_type == "related_to":
         # Based on shared tags
+        if not source.tags or not target.tags:
+            return 0.3
         shared = len(set(source.tags) & set(target.tags))
         return min(0.9, 0.3 + (shared * 0.2))
     
@@ -6,20 +6,74 @@ Provides ChunkStore for CRUD operations and ChunkIndex for fast lookups.
 """
 
 import json
+import math
 import uuid
+import bisect
 import shutil
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field, asdict
+from functools import cached_property
 from pathlib import Path
 from typing import Optional, List, Dict, Set, Any
 from enum import Enum
 import logging
 
+# Try to import orjson for faster JSON (de)serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configure logging for audit trail
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _has_non_finite(obj: Any) -> bool:
+    """True if obj contains a NaN or infinite float anywhere."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    return False
+
+
+def _json_dumps(obj: Any, indent: Optional[int] = 2) -> str:
+    """
+    Serialize to JSON text (UTF-8, non-ASCII kept as-is).
+    
+    Uses orjson when available; it only supports 2-space indentation, so
+    other indent widths fall back to the stdlib encoder. Anything orjson
+    would reject or write differently from the stdlib (NaN/Infinity become
+    null there) is also left to the stdlib encoder.
+    """
+    if ORJSON_AVAILABLE and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            data = orjson.dumps(obj, option=option)
+        except orjson.JSONEncodeError:
+            data = None
+        if data is not None and not (b"null" in data and _has_non_finite(obj)):
+            return data.decode("utf-8")
+    return json.dumps(obj, indent=indent, ensure_ascii=False)
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON text, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity, which only the stdlib parser accepts
+    return json.loads(text)
+
+
 class ChunkType(str, Enum):
     """Types of memory chunks."""
     FACT = "fact"
@@ -39,6 +93,11 @@ class ChunkMetadata:
     access_count: int = 0
     last_accessed: Optional[str] = None
     
+    @cached_property
+    def created_dt(self) -> datetime:
+        """Parsed `created` timestamp (parsed once, then cached)."""
+        return datetime.fromisoformat(self.created.replace("Z", "+00:00"))
+    
     def to_dict(self) -> dict:
         return asdict(self)
     
@@ -113,12 +172,12 @@ class Chunk:
     
     def to_json(self, indent: int = 2) -> str:
         """Serialize to JSON string (human-readable)."""
-        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+        return _json_dumps(self.to_dict(), indent=indent)
     
     @classmethod
     def from_json(cls, json_str: str) -> "Chunk":
         """Deserialize from JSON string with validation."""
-        data = json.loads(json_str)
+        data = _json_loads(json_str)
         # Basic schema validation
         required = ["id", "content", "tokens", "type", "metadata"]
         for field_name in required:
@@ -158,9 +217,98 @@ class ChunkStore:
         self.metadata_index = ChunkIndex(self.index_path / "metadata_index.json")
         self.tag_index = ChunkIndex(self.index_path / "tag_index.json")
         self.link_graph = ChunkIndex(self.index_path / "link_graph.json")
+        self._batch_depth = 0
+        
+        # Creation-time index for date-range listing, built on first use:
+        # parallel lists sorted by created time, plus IDs with no timestamp
+        self._timeline_times: Optional[List[datetime]] = None
+        self._timeline_ids: List[str] = []
+        self._undated_ids: List[str] = []
         
         logger.info(f"ChunkStore initialized at {base_path}")
     
+    @contextmanager
+    def batch(self):
+        """
+        Group writes so index files are persisted once, on exit.
+        
+        Chunk files are still written immediately; only the index rewrites
+        are coalesced. Batches may be nested - the outermost one flushes.
+        
+        Usage:
+            with store.batch():
+                for content in contents:
+                    store.create_chunk(content, "note", conv_id, tokens)
+        """
+        indexes = (self.metadata_index, self.tag_index, self.link_graph)
+        self._batch_depth += 1
+        for index in indexes:
+            index.defer()
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                for index in indexes:
+                    index.flush()
+    
+    @staticmethod
+    def _parse_created(created_str: str) -> datetime:
+        """Parse an index `created` value (ISO 8601, Z suffix)."""
+        return datetime.fromisoformat(created_str.replace("Z", "+00:00"))
+    
+    def _ensure_timeline(self):
+        """Build the creation-time index from the metadata index."""
+        if self._timeline_times is not None:
+            return
+        dated = []
+        self._undated_ids = []
+        for chunk_id in self.metadata_index.get_all_keys():
+            created_str = (self.metadata_index.get(chunk_id) or {}).get("created", "")
+            if created_str:
+                dated.append((self._parse_created(created_str), chunk_id))
+            else:
+                self._undated_ids.append(chunk_id)
+        dated.sort(key=lambda entry: entry[0])
+        self._timeline_times = [created for created, _ in dated]
+        self._timeline_ids = [chunk_id for _, chunk_id in dated]
+    
+    def _timeline_add(self, chunk_id: str, created_str: str):
+        """Insert a new chunk into the creation-time index (if built)."""
+        if self._timeline_times is None:
+            return
+        created = self._parse_created(created_str)
+        pos = bisect.bisect_right(self._timeline_times, created)
+        self._timeline_times.insert(pos, created)
+        self._timeline_ids.insert(pos, chunk_id)
+    
+    def _timeline_remove(self, chunk_id: str):
+        """Drop a chunk from the creation-time index (if built)."""
+        if self._timeline_times is None:
+            return
+        if chunk_id in self._undated_ids:
+            self._undated_ids.remove(chunk_id)
+            return
+        try:
+            pos = self._timeline_ids.index(chunk_id)
+        except ValueError:
+            return
+        del self._timeline_times[pos]
+        del self._timeline_ids[pos]
+    
+    def _timeline_range(self, created_after: datetime = None,
+                        created_before: datetime = None) -> List[str]:
+        """Chunk IDs created within [created_after, created_before]."""
+        self._ensure_timeline()
+        lo = 0
+        hi = len(self._timeline_times)
+        if created_after:
+            lo = bisect.bisect_left(self._timeline_times, created_after)
+        if created_before:
+            hi = bisect.bisect_right(self._timeline_times, created_before)
+        # Undated chunks have never been excluded by date filters
+        return self._timeline_ids[lo:hi] + self._undated_ids
+    
     def _generate_id(self) -> str:
         """Generate unique chunk ID with timestamp."""
         now = datetime.utcnow()
@@ -242,6 +390,7 @@ class ChunkStore:
             "created": now,
             "confidence": confidence
         })
+        self._timeline_add(chunk_id, now)
         
         for tag in (tags or []):
             self.tag_index.add_to_list(tag, chunk_id)
@@ -259,6 +408,21 @@ class ChunkStore:
         Returns:
             Chunk if found, None otherwise
         """
+        chunk = self._read_chunk(chunk_id)
+        if chunk is None:
+            return None
+        
+        # Update access tracking
+        chunk.metadata.access_count += 1
+        chunk.metadata.last_accessed = datetime.utcnow().isoformat() + "Z"
+        
+        # Write back updated metadata
+        self._get_chunk_path(chunk_id).write_text(chunk.to_json(), encoding="utf-8")
+        
+        return chunk
+    
+    def _read_chunk(self, chunk_id: str) -> Optional[Chunk]:
+        """Load chunk from disk without touching access tracking."""
         if not self._validate_chunk_id(chunk_id):
             logger.warning(f"Invalid chunk ID format: {chunk_id}")
             return None
@@ -269,17 +433,7 @@ class ChunkStore:
             return None
         
         try:
-            json_str = chunk_path.read_text(encoding="utf-8")
-            chunk = Chunk.from_json(json_str)
-            
-            # Update access tracking
-            chunk.metadata.access_count += 1
-            chunk.metadata.last_accessed = datetime.utcnow().isoformat() + "Z"
-            
-            # Write back updated metadata
-            chunk_path.write_text(chunk.to_json(), encoding="utf-8")
-            
-            return chunk
+            return Chunk.from_json(chunk_path.read_text(encoding="utf-8"))
         except (json.JSONDecodeError, ValueError) as e:
             logger.error(f"Corrupted chunk file {chunk_id}: {e}")
             return None
@@ -364,6 +518,7 @@ class ChunkStore:
         
         # Update indexes
         self.metadata_index.remove(chunk_id)
+        self._timeline_remove(chunk_id)
         # Note: tag_index cleanup would require reading the chunk first
         
         return True
@@ -378,8 +533,27 @@ class ChunkStore:
         Returns:
             List of matching chunk IDs
         """
-        # Start with all chunks from metadata index
-        all_chunks = self.metadata_index.get_all_keys()
+        # Filter by tags first (intersection - must have ALL tags) so
+        # non-matching chunks never reach the metadata lookups below
+        tag_matches = None
+        if tags:
+            # Start with chunks that have the first tag
+            tag_matches = set(self.tag_index.get_list(tags[0]))
+            # Intersect with each additional tag
+            for tag in tags[1:]:
+                if not tag_matches:
+                    break
+                tag_matches &= set(self.tag_index.get_list(tag))
+            if not tag_matches:
+                return []
+        
+        # Start with all chunks, or only those in the date range
+        if created_after or created_before:
+            all_chunks = self._timeline_range(created_after, created_before)
+        else:
+            all_chunks = self.metadata_index.get_all_keys()
+        if tag_matches is not None:
+            all_chunks = [cid for cid in all_chunks if cid in tag_matches]
         result = []
         
         for chunk_id in all_chunks:
@@ -391,26 +565,8 @@ class ChunkStore:
             if conversation_id and metadata.get("conversation_id") != conversation_id:
                 continue
             
-            # Filter by date
-            created_str = metadata.get("created", "")
-            if created_str:
-                created = datetime.fromisoformat(created_str.replace("Z", "+00:00"))
-                if created_after and created < created_after:
-                    continue
-                if created_before and created > created_before:
-                    continue
-            
             result.append(chunk_id)
         
-        # Filter by tags (intersection - must have ALL tags)
-        if tags:
-            # Start with chunks that have the first tag
-            tag_matches = set(self.tag_index.get_list(tags[0]))
-            # Intersect with each additional tag
-            for tag in tags[1:]:
-                tag_matches &= set(self.tag_index.get_list(tag))
-            result = [cid for cid in result if cid in tag_matches]
-        
         return result
     
     def get_stats(self) -> Dict[str, Any]:
@@ -439,19 +595,29 @@ class ChunkIndex:
     Simple JSON-based index for fast lookups.
     
     Maintains an in-memory cache with periodic disk persistence.
+    The file is read on first access, not on construction.
+    While deferred (see ChunkStore.batch), writes only mark the index dirty.
     """
     
     def __init__(self, index_path: Path):
         self.index_path = Path(index_path)
         self._cache: Dict[str, Any] = {}
         self._list_indexes: Dict[str, Set[str]] = {}  # For tag -> chunks mapping
-        self._load()
+        self._deferred = False
+        self._dirty = False
+        self._loaded = False
+    
+    def _ensure_loaded(self):
+        """Load index from disk the first time it is used."""
+        if not self._loaded:
+            self._loaded = True
+            self._load()
     
     def _load(self):
         """Load index from disk."""
         if self.index_path.exists():
             try:
-                data = json.loads(self.index_path.read_text(encoding="utf-8"))
+                data = _json_loads(self.index_path.read_text(encoding="utf-8"))
                 self._cache = data.get("entries", {})
                 self._list_indexes = {
                     k: set(v) for k, v in data.get("lists", {}).items()
@@ -462,35 +628,54 @@ class ChunkIndex:
                 self._list_indexes = {}
     
     def _save(self):
-        """Persist index to disk."""
+        """Persist index to disk (or mark dirty while deferred)."""
+        if self._deferred:
+            self._dirty = True
+            return
         data = {
             "entries": self._cache,
             "lists": {k: list(v) for k, v in self._list_indexes.items()},
             "updated": datetime.utcnow().isoformat() + "Z"
         }
-        self.index_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        self.index_path.write_text(_json_dumps(data), encoding="utf-8")
+        self._dirty = False
+    
+    def defer(self):
+        """Hold back disk writes until flush() is called."""
+        self._deferred = True
+    
+    def flush(self):
+        """Stop deferring and write any pending changes to disk."""
+        self._deferred = False
+        if self._dirty:
+            self._save()
     
     def add(self, key: str, value: Any):
         """Add entry to index."""
+        self._ensure_loaded()
         self._cache[key] = value
         self._save()
     
     def get(self, key: str) -> Optional[Any]:
         """Get entry by key."""
+        self._ensure_loaded()
         return self._cache.get(key)
     
     def remove(self, key: str):
         """Remove entry from index."""
+        self._ensure_loaded()
         if key in self._cache:
             del self._cache[key]
             self._save()
     
     def get_all_keys(self) -> List[str]:
         """Get all keys in index."""
+        self._ensure_loaded()
         return list(self._cache.keys())
     
     def add_to_list(self, list_key: str, item: str):
         """Add item to a list index (e.g., tag -> chunks)."""
+        self._ensure_loaded()
         if list_key not in self._list_indexes:
             self._list_indexes[list_key] = set()
         self._list_indexes[list_key].add(item)
@@ -498,12 +683,14 @@ class ChunkIndex:
     
     def remove_from_list(self, list_key: str, item: str):
         """Remove item from a list index."""
+        self._ensure_loaded()
         if list_key in self._list_indexes:
             self._list_indexes[list_key].discard(item)
             self._save()
     
     def get_list(self, list_key: str) -> List[str]:
         """Get all items in a list."""
+        self._ensure_loaded()
         return list(self._list_indexes.get(list_key, []))
 
 
@@ -127,3 +127,21 @@ class RememberOperation:
             "total_tokens": total_tokens,
             "chunks_created": len(created_chunks)
         }
+    
+    def remember_many(self, entries: List[dict]) -> List[dict]:
+        """
+        Remember several items, persisting the store's indexes once.
+        
+        Args:
+            entries: One dict of remember() keyword arguments per item
+                (content and conversation_id required)
+        
+        Returns:
+            Confirmation dicts from remember(), in the same order
+        
+        Raises:
+            ValueError, TypeError: As remember(); items already stored
+                before the failing entry are kept and indexed
+        """
+        with self.store.batch():
+            return [self.remember(**entry) for entry in entries]
@@ -64,6 +64,22 @@ BLOCKED_MODULES = {
 ALLOWED_MODULES = set()
 
 
+# Static retrieval prompt; only the query is substituted per retrieve() call
+_RETRIEVAL_PROMPT_TEMPLATE = """You are a memory retrieval system. Answer the following query using the available memory functions.
+
+Available functions:
+- read_chunk(chunk_id): Read a chunk by ID
+- search_chunks(query, limit=10): Search for chunks
+- list_chunks_by_tag(tag): List chunks with a tag
+- get_linked_chunks(chunk_id, link_type=None): Get linked chunks
+- llm_query(prompt, context=None): Ask LLM for help
+- FINAL(answer): Call when you have the final answer
+
+Query: {query}
+
+Write Python code to solve this query. Use FINAL('your answer') when done."""
+
+
 def safe_import(name, globals=None, locals=None, fromlist=(), level=0):
     """Safe import function that only allows specific modules."""
     base_module = name.split('.')[0] if name else ''
@@ -643,19 +659,7 @@ class REPLSession:
         max_iter = max_iterations if max_iterations is not None else self.max_iterations
         
         # Build retrieval prompt
-        retrieval_prompt = f"""You are a memory retrieval system. Answer the following query using the available memory functions.
-
-Available functions:
-- read_chunk(chunk_id): Read a chunk by ID
-- search_chunks(query, limit=10): Search for chunks
-- list_chunks_by_tag(tag): List chunks with a tag
-- get_linked_chunks(chunk_id, link_type=None): Get linked chunks
-- llm_query(prompt, context=None): Ask LLM for help
-- FINAL(answer): Call when you have the final answer
-
-Query: {query}
-
-Write Python code to solve this query. Use FINAL('your answer') when done."""
+        retrieval_prompt = _RETRIEVAL_PROMPT_TEMPLATE.format(query=query)
         
         # Iterative retrieval loop
         for iteration in range(max_iter):
@@ -3,6 +3,7 @@ MERIDIAN Brain - Auto-Linking Tests
 Test suite for automatic link generation.
 """
 
+import json
 import tempfile
 import shutil
 import unittest
@@ -125,6 +126,21 @@ class TestLinkGraph(unittest.TestCase):
         self.assertIn("chunk-b", reachable)
         self.assertNotIn("chunk-c", reachable)
     
+    def test_get_path_filter_by_type(self):
+        """Test path finding only follows allowed link types."""
+        # a -> b (context_of) -> c (follows), a -> c (related_to)
+        self.graph.add_link("chunk-a", "chunk-b", "context_of")
+        self.graph.add_link("chunk-b", "chunk-c", "follows")
+        self.graph.add_link("chunk-a", "chunk-c", "related_to")
+        
+        self.assertEqual(self.graph.get_path("chunk-a", "chunk-c"),
+                         ["chunk-a", "chunk-c"])
+        self.assertEqual(
+            self.graph.get_path("chunk-a", "chunk-c", link_types=["context_of", "follows"]),
+            ["chunk-a", "chunk-b", "chunk-c"]
+        )
+        self.assertIsNone(self.graph.get_path("chunk-a", "chunk-c", link_types=["context_of"]))
+    
     def test_persistence(self):
         """Test that graph persists to disk."""
         self.graph.add_link("chunk-a", "chunk-b", "context_of")
@@ -134,23 +150,112 @@ class TestLinkGraph(unittest.TestCase):
         
         outgoing = new_graph.get_outgoing("chunk-a", "context_of")
         self.assertIn("chunk-b", outgoing)
+    
+    def test_snapshot_truncates_oplog(self):
+        """Snapshot plus op-log should reload to the same graph."""
+        self.graph.add_link("chunk-a", "chunk-b", "context_of")
+        # First link writes the snapshot directly
+        self.assertTrue(self.index_path.exists())
+        self.assertFalse(self.graph.oplog_path.exists())
+        
+        self.graph.add_link("chunk-b", "chunk-c", "follows")
+        self.graph.add_link("chunk-b", "chunk-c", "follows")  # duplicate, not logged
+        self.assertEqual(len(self.graph.oplog_path.read_text().splitlines()), 1)
+        
+        new_graph = LinkGraph(str(self.index_path))
+        self.assertEqual(new_graph.get_outgoing("chunk-a", "context_of"), ["chunk-b"])
+        self.assertEqual(new_graph.get_outgoing("chunk-b", "follows"), ["chunk-c"])
+        self.assertEqual(new_graph.get_incoming("chunk-c", "follows"), ["chunk-b"])
+    
+    def test_outgoing_order_survives_reload(self):
+        """get_outgoing() and traverse() order should not change on reload."""
+        self.graph.add_link("chunk-a", "chunk-b", "related_to")
+        self.graph.add_link("chunk-a", "chunk-c", "follows")
+        self.graph.add_link("chunk-a", "chunk-d", "related_to")
+        outgoing = self.graph.get_outgoing("chunk-a")
+        reachable = self.graph.traverse("chunk-a")
+        
+        replayed = LinkGraph(str(self.index_path))
+        self.assertEqual(replayed.get_outgoing("chunk-a"), outgoing)
+        self.assertEqual(replayed.traverse("chunk-a"), reachable)
+        
+        self.graph.snapshot()
+        reloaded = LinkGraph(str(self.index_path))
+        self.assertEqual(reloaded.get_outgoing("chunk-a"), outgoing)
+        self.assertEqual(reloaded.traverse("chunk-a"), reachable)
+    
+    def test_oplog_torn_write_recovery(self):
+        """A torn final op-log line should not swallow the next link."""
+        self.graph.add_link("chunk-a", "chunk-b", "related_to")
+        self.graph.add_link("chunk-a", "chunk-c", "related_to")
+        with self.graph.oplog_path.open("a", encoding="utf-8") as f:
+            f.write('{"op": "add", "fr')
+        
+        graph = LinkGraph(str(self.index_path))
+        graph.add_link("chunk-a", "chunk-d", "related_to")
+        
+        new_graph = LinkGraph(str(self.index_path))
+        self.assertEqual(new_graph.get_outgoing("chunk-a", "related_to"),
+                         ["chunk-b", "chunk-c", "chunk-d"])
+    
+    def test_oplog_skips_malformed_ops(self):
+        """Op-log lines that parse but are malformed should be skipped."""
+        self.graph.add_link("chunk-a", "chunk-b", "related_to")
+        with self.graph.oplog_path.open("a", encoding="utf-8") as f:
+            f.write('{"op": "add"}\n')
+            f.write('[1, 2]\n')
+            f.write('{"op": "add", "from": 1, "to": "chunk-x", "type": "follows"}\n')
+        self.graph.add_link("chunk-a", "chunk-c", "related_to")
+        
+        new_graph = LinkGraph(str(self.index_path))
+        self.assertEqual(new_graph.get_outgoing("chunk-a", "related_to"),
+                         ["chunk-b", "chunk-c"])
+        self.assertEqual(new_graph.get_incoming("chunk-x"), [])
+    
+    def test_oplog_compacts_when_large(self):
+        """Op-log should be folded into the snapshot once it grows too big."""
+        self.graph.MIN_SNAPSHOT_BYTES = 0
+        self.graph.SNAPSHOT_RATIO = 1
+        for i in range(10):
+            self.graph.add_link("chunk-a", f"chunk-{i}", "related_to")
+        
+        # At least one compaction rewrote the snapshot past the first link
+        snapshot = json.loads(self.index_path.read_text())
+        self.assertGreater(len(snapshot["forward"]["chunk-a"]["related_to"]), 1)
+        logged = 0
+        if self.graph.oplog_path.exists():
+            logged = len(self.graph.oplog_path.read_text().splitlines())
+        self.assertLess(logged, 9)
+        
+        new_graph = LinkGraph(str(self.index_path))
+        self.assertEqual(new_graph.get_outgoing("chunk-a", "related_to"),
+                         [f"chunk-{i}" for i in range(10)])
 
 
 class TestAutoLinker(unittest.TestCase):
-    """Test AutoLinker functionality."""
+    """
+    Test AutoLinker functionality.
     
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.store = ChunkStore(self.temp_dir)
-        self.linker = AutoLinker(self.store, temporal_window_minutes=5)
+    All tests share one store: each test uses its own conversation IDs
+    (from _id_pool) and tags, so chunks from other tests never match.
+    """
     
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    @classmethod
+    def setUpClass(cls):
+        # Unique conversation suffixes, generated once for the whole class
+        cls._id_pool = iter([uuid.uuid4().hex[:8] for _ in range(32)])
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.store = ChunkStore(cls.temp_dir)
+        cls.linker = AutoLinker(cls.store, temporal_window_minutes=5)
+    
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
     
     def test_conversation_linking(self):
         """Test context_of links for same conversation."""
         # Create first chunk in unique conversation
-        unique_conv = f"conv-test-1-{uuid.uuid4().hex[:8]}"
+        unique_conv = f"conv-test-1-{next(self._id_pool)}"
         chunk1 = self.store.create_chunk(
             "First message",
             "note",
@@ -185,7 +290,7 @@ class TestAutoLinker(unittest.TestCase):
     def test_temporal_following(self):
         """Test follows links within temporal window."""
         # Create chunks in same unique conversation
-        conv_id = f"conv-test-2-{uuid.uuid4().hex[:8]}"
+        conv_id = f"conv-test-2-{next(self._id_pool)}"
         chunk1 = self.store.create_chunk(
             "Earlier message",
             "note",
@@ -210,7 +315,7 @@ class TestAutoLinker(unittest.TestCase):
     def test_tag_related_linking(self):
         """Test related_to links for shared tags."""
         # Create chunks with same tags but different conversations
-        unique_id = uuid.uuid4().hex[:8]
+        unique_id = next(self._id_pool)
         chunk1 = self.store.create_chunk(
             "Feature A docs",
             "note",
@@ -235,10 +340,23 @@ class TestAutoLinker(unittest.TestCase):
         chunk1_refreshed = self.store.get_chunk(chunk1.id)
         self.assertIn(chunk2.id, chunk1_refreshed.links.related_to)
     
+    def test_back_links_do_not_count_as_access(self):
+        """Updating an existing chunk's links should not bump access_count."""
+        unique_id = next(self._id_pool)
+        conv_id = f"conv-access-{unique_id}"
+        chunk1 = self.store.create_chunk("First", "note", conv_id, 5)
+        chunk1 = self.linker.link_on_create(chunk1)
+        chunk2 = self.store.create_chunk("Second", "note", conv_id, 5)
+        self.linker.link_on_create(chunk2)
+        
+        stored = self.store._read_chunk(chunk1.id)
+        self.assertIn(chunk2.id, stored.links.context_of)
+        self.assertEqual(stored.metadata.access_count, 0)
+    
     def test_no_duplicate_context_links(self):
         """Test that related_to doesn't duplicate context_of."""
         # Create two chunks in same conversation with shared tags
-        conv_id = f"conv-dedup-1-{uuid.uuid4().hex[:8]}"
+        conv_id = f"conv-dedup-1-{next(self._id_pool)}"
         chunk1 = self.store.create_chunk(
             "First with tag",
             "note",
@@ -265,7 +383,7 @@ class TestAutoLinker(unittest.TestCase):
     
     def test_different_conversations_no_context(self):
         """Test that different conversations don't get context_of links."""
-        unique_id = uuid.uuid4().hex[:8]
+        unique_id = next(self._id_pool)
         chunk1 = self.store.create_chunk(
             "Message A",
             "note",
@@ -290,7 +408,7 @@ class TestAutoLinker(unittest.TestCase):
     
     def test_link_graph_integration(self):
         """Test that links are added to LinkGraph."""
-        conv_id = f"conv-graph-1-{uuid.uuid4().hex[:8]}"
+        conv_id = f"conv-graph-1-{next(self._id_pool)}"
         chunk1 = self.store.create_chunk(
             "First",
             "note",
@@ -430,6 +548,18 @@ class TestLinkStrength(unittest.TestCase):
         )
         strength = calculate_link_strength(chunk1, chunk3, "related_to")
         self.assertEqual(strength, 0.9)  # capped
+        
+        # No tags on one side - base strength
+        chunk4 = Chunk(
+            id="d",
+            content="test",
+            tokens=5,
+            type="note",
+            metadata=None,
+            links=ChunkLinks()
+        )
+        strength = calculate_link_strength(chunk1, chunk4, "related_to")
+        self.assertEqual(strength, 0.3)
 
 
 class TestManualLinks(unittest.TestCase):
@@ -502,6 +632,11 @@ class TestManualLinks(unittest.TestCase):
 class TestIntegration(unittest.TestCase):
     """Integration tests combining multiple features."""
     
+    @classmethod
+    def setUpClass(cls):
+        # Unique conversation suffixes, generated once for the whole class
+        cls._id_pool = iter([uuid.uuid4().hex[:8] for _ in range(32)])
+    
     def setUp(self):
         self.temp_dir = tempfile.mkdtemp()
         self.store = ChunkStore(self.temp_dir)
@@ -527,35 +662,36 @@ class TestIntegration(unittest.TestCase):
     
     def test_complex_scenario(self):
         """Test a complex scenario with multiple chunks and link types."""
-        unique_id = uuid.uuid4().hex[:8]
+        unique_id = next(self._id_pool)
         conv1_id = f"conv-complex-1-{unique_id}"
         conv2_id = f"conv-complex-2-{unique_id}"
         
-        # Conversation 1: Three related chunks
-        c1 = create_chunk_with_links(
-            self.store, self.linker,
-            "First in conv 1", "note", conv1_id, 5,
-            tags=["project-alpha"]
-        )
-        
-        c2 = create_chunk_with_links(
-            self.store, self.linker,
-            "Second in conv 1", "note", conv1_id, 5,
-            tags=["project-alpha", "decision"]
-        )
-        
-        c3 = create_chunk_with_links(
-            self.store, self.linker,
-            "Third in conv 1", "note", conv1_id, 5,
-            tags=["project-alpha"]
-        )
-        
-        # Conversation 2: Related by tag
-        c4 = create_chunk_with_links(
-            self.store, self.linker,
-            "In conv 2", "note", conv2_id, 5,
-            tags=["project-alpha"]
-        )
+        with self.store.batch():
+            # Conversation 1: Three related chunks
+            c1 = create_chunk_with_links(
+                self.store, self.linker,
+                "First in conv 1", "note", conv1_id, 5,
+                tags=["project-alpha"]
+            )
+            
+            c2 = create_chunk_with_links(
+                self.store, self.linker,
+                "Second in conv 1", "note", conv1_id, 5,
+                tags=["project-alpha", "decision"]
+            )
+            
+            c3 = create_chunk_with_links(
+                self.store, self.linker,
+                "Third in conv 1", "note", conv1_id, 5,
+                tags=["project-alpha"]
+            )
+            
+            # Conversation 2: Related by tag
+            c4 = create_chunk_with_links(
+                self.store, self.linker,
+                "In conv 2", "note", conv2_id, 5,
+                tags=["project-alpha"]
+            )
         
         # Verify links
         # c2 should context_of c1
@@ -116,6 +116,26 @@ class TestRememberBasic(unittest.TestCase):
         metadata = self.store.metadata_index.get(chunk_id)
         self.assertIsNotNone(metadata)
         self.assertEqual(metadata["conversation_id"], "test-conv-index")
+    
+    def test_remember_many(self):
+        """remember_many() should store every entry and index them all."""
+        results = self.remember.remember_many([
+            {"content": "User prefers Python", "conversation_id": "test-conv-many"},
+            {"content": "User uses Vim", "conversation_id": "test-conv-many",
+             "tags": ["editor"]},
+        ])
+        
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(r["success"] for r in results))
+        
+        # Indexes are flushed when the batch ends
+        reloaded = ChunkStore(self.temp_dir)
+        for result in results:
+            for chunk_id in result["chunk_ids"]:
+                self.assertIsNotNone(reloaded.metadata_index.get(chunk_id))
+        self.assertEqual(
+            reloaded.list_chunks(tags=["editor"]), results[1]["chunk_ids"]
+        )
 
 
 class TestRememberChunking(unittest.TestCase):
@@ -351,6 +371,27 @@ class TestRememberTagging(unittest.TestCase):
         chunk1_id = result1["chunk_ids"][0]
         self.assertIn(chunk1_id, chunk2.links.related_to,
                      "Chunks should be related via shared tag")
+    
+    def test_non_string_tag(self):
+        """Non-string tags should be stored (as their JSON key form) and not break later writes."""
+        result = self.remember.remember(
+            content="Release planned for 2024",
+            conversation_id="conv-year",
+            tags=[2024]
+        )
+        self.assertTrue(result["success"])
+        
+        # A later tagged write to the same store must still succeed
+        result2 = self.remember.remember(
+            content="User prefers dark mode",
+            conversation_id="conv-year",
+            tags=["fine"]
+        )
+        self.assertTrue(result2["success"])
+        
+        reloaded = ChunkStore(self.temp_dir)
+        self.assertEqual(reloaded.list_chunks(tags=["2024"]), result["chunk_ids"])
+        self.assertEqual(reloaded.list_chunks(tags=["fine"]), result2["chunk_ids"])
 
 
 class TestRememberValidation(unittest.TestCase):
@@ -7,14 +7,12 @@ Run: python brain/scripts/test_repl.py
 
 import unittest
 from unittest.mock import Mock, patch, call, MagicMock
-import tempfile
-import shutil
 import threading
 import time
 import sys
 import io
 import contextlib
-from pathlib import Path
+from types import SimpleNamespace
 from typing import Optional, Dict, Any, List
 
 # Import the modules under test (will be created in D1.3)
@@ -33,26 +31,39 @@ except ImportError:
     get_linked_chunks = None
 
 
+class _REPLTestMixin:
+    """Fresh REPLSession over Mock store/LLM for each test."""
+    
+    def setUp(self):
+        self.mock_store = Mock()
+        self.mock_llm = Mock()
+        self.repl = self.make_repl()
+    
+    def make_repl(self, **kwargs) -> "REPLSession":
+        """Build a session over this test's mock store and LLM."""
+        return REPLSession(
+            chunk_store=self.mock_store,
+            llm_client=self.mock_llm,
+            **kwargs
+        )
+
+
 # Skip all tests if REPL module doesn't exist yet
-@unittest.skipIf(REPLSession is None, "REPL Environment not yet implemented")
+requires_repl = unittest.skipIf(REPLSession is None, "REPL Environment not yet implemented")
+
+
+@requires_repl
 class TestREPLInitialization(unittest.TestCase):
     """Test REPL setup and configuration."""
     
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.base_path = Path(self.temp_dir) / "brain" / "memory"
-        
         # Mock ChunkStore
         self.mock_store = Mock()
-        self.mock_store.base_path = self.base_path
         
         # Mock LLM client
         self.mock_llm = Mock()
         self.mock_llm.complete = Mock(return_value="FINAL('test answer')")
         
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_requires_chunk_store(self):
         """Should fail fast if ChunkStore not provided."""
         with self.assertRaises((ValueError, TypeError)):
@@ -84,24 +95,19 @@ class TestREPLInitialization(unittest.TestCase):
         self.assertEqual(repl.timeout_seconds, 30)
 
 
-@unittest.skipIf(REPLSession is None, "REPL Environment not yet implemented")
+@requires_repl
 class TestSafeExecution(unittest.TestCase):
     """Test Python sandboxing - CRITICAL for security."""
     
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.mock_store = Mock()
-        self.mock_store.base_path = Path(self.temp_dir)
-        self.mock_llm = Mock()
+        self.mock_store = SimpleNamespace()
+        self.mock_llm = SimpleNamespace()
         
         self.repl = REPLSession(
             chunk_store=self.mock_store,
             llm_client=self.mock_llm
         )
     
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_blocks_import(self):
         """Should block __import__ attempts."""
         # Malicious: __import__('os').system('rm -rf /')
@@ -193,13 +199,11 @@ class TestSafeExecution(unittest.TestCase):
             self.repl.execute('open(".." + "/" * 10 + "etc/passwd")')
 
 
-@unittest.skipIf(REPLSession is None, "REPL Environment not yet implemented")
+@requires_repl
 class TestREPLFunctions(unittest.TestCase):
     """Test functions exposed to LLM."""
     
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        
         # Create mock store with test data
         self.mock_store = Mock()
         self.mock_chunk = Mock()
@@ -223,9 +227,6 @@ class TestREPLFunctions(unittest.TestCase):
             llm_client=self.mock_llm
         )
     
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_read_chunk_returns_dict(self):
         """read_chunk() should return chunk as dict."""
         result = self.repl.execute('read_chunk("chunk-2026-02-10-abc123")')
@@ -301,14 +302,12 @@ class TestREPLFunctions(unittest.TestCase):
         self.assertIsInstance(result, list)
 
 
-@unittest.skipIf(REPLSession is None, "REPL Environment not yet implemented")
+@requires_repl
 class TestLLMQuery(unittest.TestCase):
     """Test recursive llm_query() function."""
     
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
         self.mock_store = Mock()
-        self.mock_store.base_path = Path(self.temp_dir)
         
         # Mock LLM client
         self.mock_llm = Mock()
@@ -321,9 +320,6 @@ class TestLLMQuery(unittest.TestCase):
             max_depth=3
         )
     
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_makes_api_call(self):
         """llm_query() should call LLM client with prompt."""
         self.repl.execute('llm_query("Analyze this")')
@@ -375,23 +371,10 @@ class TestLLMQuery(unittest.TestCase):
         self.assertEqual(self.repl._current_depth, 0)
 
 
-@unittest.skipIf(REPLSession is None, "REPL Environment not yet implemented")
-class TestFinalTermination(unittest.TestCase):
+@requires_repl
+class TestFinalTermination(_REPLTestMixin, unittest.TestCase):
     """Test FINAL() termination condition."""
     
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.mock_store = Mock()
-        self.mock_llm = Mock()
-        
-        self.repl = REPLSession(
-            chunk_store=self.mock_store,
-            llm_client=self.mock_llm
-        )
-    
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_final_sets_result(self):
         """FINAL('answer') should set result and signal completion."""
         self.repl.execute("FINAL('my answer')")
@@ -429,23 +412,10 @@ class TestFinalTermination(unittest.TestCase):
         self.assertIsNone(result)
 
 
-@unittest.skipIf(REPLSession is None, "REPL Environment not yet implemented")
-class TestStatePersistence(unittest.TestCase):
+@requires_repl
+class TestStatePersistence(_REPLTestMixin, unittest.TestCase):
     """Test variable persistence across iterations."""
     
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.mock_store = Mock()
-        self.mock_llm = Mock()
-        
-        self.repl = REPLSession(
-            chunk_store=self.mock_store,
-            llm_client=self.mock_llm
-        )
-    
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_variables_persist(self):
         """Variables set in iteration 1 should be available in iteration 2."""
         self.repl.execute('x = 42')
@@ -493,13 +463,11 @@ class TestStatePersistence(unittest.TestCase):
         self.assertIn("after", output)
 
 
-@unittest.skipIf(REPLSession is None, "REPL Environment not yet implemented")
+@requires_repl
 class TestRetrieveWorkflow(unittest.TestCase):
     """Test full RLM retrieval workflow."""
     
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        
         # Setup mock store with test chunks
         self.mock_store = Mock()
         self.mock_store.list_chunks = Mock(return_value=[
@@ -530,9 +498,6 @@ class TestRetrieveWorkflow(unittest.TestCase):
             max_iterations=5
         )
     
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_single_iteration_success(self):
         """Simple query answered in one iteration."""
         # LLM calls FINAL() immediately
@@ -560,9 +525,7 @@ class TestRetrieveWorkflow(unittest.TestCase):
 
     def test_retrieve_tracks_cost(self):
         """retrieve() should track LLM cost."""
-        response = Mock()
-        response.text = "FINAL('Python')"
-        response.cost_usd = 0.005
+        response = SimpleNamespace(text="FINAL('Python')", cost_usd=0.005)
         self.mock_llm.complete = Mock(return_value=response)
         
         result = self.repl.retrieve("What language does the user like?")
@@ -590,24 +553,19 @@ class TestRetrieveWorkflow(unittest.TestCase):
         self.assertIsNone(result)
 
 
-@unittest.skipIf(REPLSession is None, "REPL Environment not yet implemented")
+@requires_repl
 class TestEdgeCases(unittest.TestCase):
     """Edge cases and adversarial inputs."""
     
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.mock_store = Mock()
-        self.mock_store.base_path = Path(self.temp_dir)
-        self.mock_llm = Mock()
+        self.mock_store = SimpleNamespace()
+        self.mock_llm = SimpleNamespace()
         
         self.repl = REPLSession(
             chunk_store=self.mock_store,
             llm_client=self.mock_llm
         )
     
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_empty_code(self):
         """Executing empty code should not crash."""
         result = self.repl.execute("")
@@ -706,24 +664,27 @@ recurse(0)
         self.assertEqual(result, 10000)
 
 
-@unittest.skipIf(REPLSession is None, "REPL Environment not yet implemented")
+@requires_repl
 class TestSecurity(unittest.TestCase):
-    """Security tests - sandbox escape attempts."""
-    
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.mock_store = Mock()
-        self.mock_store.base_path = Path(self.temp_dir)
-        self.mock_llm = Mock()
-        
-        self.repl = REPLSession(
-            chunk_store=self.mock_store,
-            llm_client=self.mock_llm
+    """
+    Security tests - sandbox escape attempts.
+    
+    Every test here expects its code to be rejected, so none of them change
+    REPL state and one session is shared by the class. A test that needs to
+    run code successfully should build its own REPLSession.
+    """
+    
+    @classmethod
+    def setUpClass(cls):
+        # Shared by every test: the mocked store never writes into it
+        cls.mock_store = SimpleNamespace()
+        cls.mock_llm = SimpleNamespace()
+        
+        cls.repl = REPLSession(
+            chunk_store=cls.mock_store,
+            llm_client=cls.mock_llm
         )
     
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_blocks_getattr_exploitation(self):
         """Should block getattr exploitation for builtins."""
         with self.assertRaises(SandboxViolation):
@@ -760,20 +721,15 @@ class TestSecurity(unittest.TestCase):
             self.repl.execute('setattr(__builtins__, "evil", lambda: None)')
 
 
-@unittest.skipIf(REPLSession is None, "REPL Environment not yet implemented")
+@requires_repl
 class TestConcurrency(unittest.TestCase):
     """Test thread safety."""
     
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
         self.mock_store = Mock()
-        self.mock_store.base_path = Path(self.temp_dir)
         self.mock_llm = Mock()
         self.mock_llm.complete = Mock(return_value="FINAL('result')")
     
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_isolated_instances(self):
         """Multiple REPL instances should not interfere."""
         repl1 = REPLSession(chunk_store=self.mock_store, llm_client=self.mock_llm)
@@ -819,25 +775,14 @@ class TestConcurrency(unittest.TestCase):
         self.assertEqual(len(results), 5)
 
 
-@unittest.skipIf(REPLSession is None, "REPL Environment not yet implemented")
-class TestCostTracking(unittest.TestCase):
+@requires_repl
+class TestCostTracking(_REPLTestMixin, unittest.TestCase):
     """Test cost tracking functionality."""
     
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.mock_store = Mock()
-        
-        self.mock_llm = Mock()
+        super().setUp()
         self.mock_llm.complete = Mock(return_value="FINAL('answer')")
         self.mock_llm.get_cost = Mock(return_value=0.002)
-        
-        self.repl = REPLSession(
-            chunk_store=self.mock_store,
-            llm_client=self.mock_llm
-        )
-    
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def test_initial_cost_zero(self):
         """Initial cost should be zero."""
@@ -852,11 +797,7 @@ class TestCostTracking(unittest.TestCase):
 
     def test_budget_exceeded(self):
         """Should signal when budget is exceeded."""
-        budgeted_repl = REPLSession(
-            chunk_store=self.mock_store,
-            llm_client=self.mock_llm,
-            max_cost_usd=0.003
-        )
+        budgeted_repl = self.make_repl(max_cost_usd=0.003)
         budgeted_repl.execute('llm_query("q1")')
         result = budgeted_repl.execute('llm_query("q2")')
         
@@ -872,23 +813,10 @@ class TestCostTracking(unittest.TestCase):
         self.assertIn("calls", breakdown)
 
 
-@unittest.skipIf(REPLSession is None, "REPL Environment not yet implemented")
-class TestContextManagement(unittest.TestCase):
+@requires_repl
+class TestContextManagement(_REPLTestMixin, unittest.TestCase):
     """Test REPL context management."""
     
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.mock_store = Mock()
-        self.mock_llm = Mock()
-        
-        self.repl = REPLSession(
-            chunk_store=self.mock_store,
-            llm_client=self.mock_llm
-        )
-    
-    def tearDown(self):
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_context_manager(self):
         """Should work as context manager."""
         with REPLSession(self.mock_store, self.mock_llm) as repl:
@@ -6,10 +6,11 @@ Run: python brain/scripts/test_storage.py
 
 import unittest
 import json
+import math
 import tempfile
 import shutil
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from memory_store import (
     ChunkStore, ChunkIndex, Chunk, ChunkMetadata, 
@@ -118,6 +119,14 @@ class TestChunkCreation(unittest.TestCase):
         # Verify it's valid JSON
         data = json.loads(chunk_path.read_text())
         self.assertEqual(data["content"], "Test content")
+    
+    def test_month_dir_recreated(self):
+        """A month directory removed while the store is open is recreated."""
+        first = self.store.create_chunk("One", "note", "conv-123", 5)
+        shutil.rmtree(self.store._get_chunk_path(first.id).parent)
+        
+        second = self.store.create_chunk("Two", "note", "conv-123", 5)
+        self.assertTrue(self.store._get_chunk_path(second.id).exists())
 
 
 class TestChunkRetrieval(unittest.TestCase):
@@ -328,6 +337,37 @@ class TestChunkListing(unittest.TestCase):
         """Should require all tags."""
         chunks = self.store.list_chunks(tags=["tag1", "tag2"])
         self.assertEqual(len(chunks), 1)  # only chunk 3
+    
+    def test_list_by_unmatched_tags(self):
+        """Tags no chunk carries (alone or combined) should match nothing."""
+        self.assertEqual(self.store.list_chunks(tags=["no-such-tag"]), [])
+        self.assertEqual(self.store.list_chunks(tags=["tag1", "no-such-tag"]), [])
+    
+    def test_list_by_tags_and_conversation(self):
+        """Tag and conversation filters should combine."""
+        chunks = self.store.list_chunks(conversation_id="conv-b", tags=["tag2"])
+        self.assertEqual(len(chunks), 1)  # only chunk 3
+    
+    def test_list_by_date_range(self):
+        """Should filter by creation time and track later creates/deletes."""
+        now = datetime.now(timezone.utc)
+        hour = timedelta(hours=1)
+        
+        self.assertEqual(len(self.store.list_chunks(created_after=now - hour)), 3)
+        self.assertEqual(self.store.list_chunks(created_after=now + hour), [])
+        self.assertEqual(self.store.list_chunks(created_before=now - hour), [])
+        
+        new_chunk = self.store.create_chunk("Chunk 4", "note", "conv-a", 5)
+        in_range = self.store.list_chunks(
+            conversation_id="conv-a",
+            created_after=now - hour,
+            created_before=now + hour
+        )
+        self.assertEqual(len(in_range), 3)
+        self.assertEqual(in_range[-1], new_chunk.id)
+        
+        self.store.delete_chunk(new_chunk.id, permanent=True)
+        self.assertNotIn(new_chunk.id, self.store.list_chunks(created_after=now - hour))
 
 
 class TestChunkIndex(unittest.TestCase):
@@ -364,6 +404,58 @@ class TestChunkIndex(unittest.TestCase):
         result = self.index.get_list("tag1")
         self.assertIn("chunk-a", result)
         self.assertIn("chunk-b", result)
+    
+    def test_lazy_load(self):
+        """Index file should be read on first access, not construction."""
+        self.index.add("key1", "value1")
+        
+        new_index = ChunkIndex(self.index_path)
+        self.assertFalse(new_index._loaded)
+        self.assertEqual(new_index.get_all_keys(), ["key1"])
+        self.assertTrue(new_index._loaded)
+
+
+class TestBatchWrites(unittest.TestCase):
+    """Test deferred index persistence via ChunkStore.batch()."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ChunkStore(Path(self.temp_dir) / "brain" / "memory")
+        self.index_file = self.store.index_path / "metadata_index.json"
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_index_written_once_on_exit(self):
+        """Index file should only be written when the batch closes."""
+        with self.store.batch():
+            chunk = self.store.create_chunk("Batched", "note", "conv-1", 5, tags=["batch"])
+            self.assertFalse(self.index_file.exists())
+            # Reads inside the batch see the in-memory index
+            self.assertIn(chunk.id, self.store.list_chunks(tags=["batch"]))
+        
+        data = json.loads(self.index_file.read_text(encoding="utf-8"))
+        self.assertIn(chunk.id, data["entries"])
+    
+    def test_nested_batches_flush_once(self):
+        """Only the outermost batch should flush."""
+        with self.store.batch():
+            with self.store.batch():
+                self.store.create_chunk("Inner", "note", "conv-1", 5)
+            self.assertFalse(self.index_file.exists())
+        
+        self.assertTrue(self.index_file.exists())
+    
+    def test_batch_persists_for_new_store(self):
+        """Batched chunks should be visible to a fresh ChunkStore."""
+        with self.store.batch():
+            ids = [
+                self.store.create_chunk(f"Chunk {i}", "note", "conv-1", 5).id
+                for i in range(3)
+            ]
+        
+        reloaded = ChunkStore(self.store.base_path)
+        self.assertEqual(sorted(reloaded.list_chunks()), sorted(ids))
 
 
 class TestChunkSerialization(unittest.TestCase):
@@ -442,6 +534,33 @@ class TestChunkSerialization(unittest.TestCase):
         self.assertEqual(restored.content, original.content)
         self.assertEqual(restored.metadata.confidence, original.metadata.confidence)
     
+    def test_chunk_json_roundtrip_nan(self):
+        """Non-finite floats should round-trip as with the stdlib encoder."""
+        original = Chunk(
+            id="chunk-test",
+            content="Test content",
+            tokens=10,
+            type="note",
+            metadata=ChunkMetadata(
+                created="2026-02-10T12:00:00Z",
+                conversation_id="conv-123",
+                confidence=float("nan")
+            ),
+            links=ChunkLinks(),
+            tags=["test"]
+        )
+        
+        restored = Chunk.from_json(original.to_json())
+        self.assertTrue(math.isnan(restored.metadata.confidence))
+    
+    def test_metadata_created_dt(self):
+        """created_dt should parse the Z timestamp and stay out of to_dict()."""
+        meta = ChunkMetadata(created="2026-02-10T12:00:00Z", conversation_id="conv-123")
+        
+        self.assertEqual(meta.created_dt.isoformat(), "2026-02-10T12:00:00+00:00")
+        self.assertIs(meta.created_dt, meta.created_dt)
+        self.assertNotIn("created_dt", meta.to_dict())
+    
     def test_invalid_json_handling(self):
         """Should raise on invalid JSON."""
         with self.assertRaises(json.JSONDecodeError):
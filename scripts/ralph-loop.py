@@ -9,59 +9,156 @@ Usage:
     python scripts/ralph-loop.py           # Build mode (unlimited)
     python scripts/ralph-loop.py 20        # Build mode (max 20 iterations)
     python scripts/ralph-loop.py plan      # Planning mode
+    python scripts/ralph-loop.py watch     # Build mode, wait for DONE between iterations
+
+Watch mode uses watchdog for file notifications when it is installed,
+and falls back to polling otherwise.
 """
 
 import sys
 import os
 import subprocess
 import re
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
 SCRIPT_DIR = Path(__file__).parent.resolve()
 PROJECT_DIR = SCRIPT_DIR.parent
 LOG_DIR = PROJECT_DIR / "logs"
 SPECS_DIR = PROJECT_DIR / "specs"
 CONSTITUTION = PROJECT_DIR / ".specify" / "memory" / "constitution.md"
 PROMPT_BUILD = PROJECT_DIR / "PROMPT_build.md"
+DONE_MARKER = b'<promise>DONE</promise>'
+DONE_TAIL_BYTES = 4096  # the marker is appended, so only the tail is checked
+POLL_INTERVAL_SECONDS = 30  # watch mode without watchdog
+
+# path -> (mtime_ns, size, text); re-read only when the file changes
+_FILE_CACHE = {}
+
+# Last spec scan: fingerprint of spec files and the spec it found
+_SPEC_SCAN_CACHE = {"fingerprint": None, "result": (None, None)}
+
+def log_line(message: str) -> str:
+    """Format timestamped log message."""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return f"[{timestamp}] {message}"
 
 def log(message: str):
     """Print timestamped log message."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] {message}")
+    print(log_line(message))
+
+def cached_read(path: Path) -> str:
+    """Read a text file, reusing the last read while mtime and size match."""
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _FILE_CACHE.get(path)
+    if cached and cached[:2] == key:
+        return cached[2]
+    text = path.read_text(encoding='utf-8')
+    _FILE_CACHE[path] = (*key, text)
+    return text
+
+def spec_is_done(path: Path) -> bool:
+    """Check the end of a spec file for the completion marker."""
+    try:
+        with path.open('rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - DONE_TAIL_BYTES))
+            return DONE_MARKER in f.read()
+    except FileNotFoundError:
+        # A removed spec has nothing left to wait for
+        return True
 
-def get_specs():
-    """Find all spec directories."""
+def wait_for_spec_done(spec_path: Path):
+    """Block until spec_path carries the DONE marker."""
+    # Check once up front: the marker may already be there
+    if spec_is_done(spec_path):
+        return
+    
+    if not WATCHDOG_AVAILABLE:
+        while not spec_is_done(spec_path):
+            time.sleep(POLL_INTERVAL_SECONDS)
+        return
+    
+    changed = threading.Event()
+    
+    class SpecChangeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            paths = (event.src_path, getattr(event, "dest_path", ""))
+            if any(Path(p).name == spec_path.name for p in paths if p):
+                changed.set()
+    
+    # Watch the directory: editors often save by replacing the file
+    observer = Observer()
+    observer.schedule(SpecChangeHandler(), str(spec_path.parent), recursive=False)
+    observer.start()
+    try:
+        # Re-checked after arming, so an edit made meanwhile is not missed
+        while not spec_is_done(spec_path):
+            # Timed, so a missed or dropped event only delays the check
+            changed.wait(POLL_INTERVAL_SECONDS)
+            changed.clear()
+    finally:
+        observer.stop()
+        observer.join()
+
+def _scan_specs():
+    """Find all spec files as (name, path, stat_result), sorted by name."""
     if not SPECS_DIR.exists():
         return []
+    with os.scandir(SPECS_DIR) as entries:
+        spec_dirs = sorted(
+            (entry for entry in entries if entry.is_dir()),
+            key=lambda entry: entry.name
+        )
     specs = []
-    for spec_dir in sorted(SPECS_DIR.iterdir()):
-        if spec_dir.is_dir():
-            spec_file = spec_dir / "spec.md"
-            if spec_file.exists():
-                specs.append((spec_dir.name, spec_file))
+    for entry in spec_dirs:
+        spec_file = Path(entry.path) / "spec.md"
+        # One stat both checks the file exists and feeds the scan fingerprint
+        try:
+            st = os.stat(spec_file)
+        except FileNotFoundError:
+            continue
+        specs.append((entry.name, spec_file, st))
     return specs
 
 def find_incomplete_spec():
-    """Find the first incomplete spec."""
-    specs = get_specs()
-    for name, path in specs:
-        content = path.read_text(encoding='utf-8')
+    """Find the first incomplete spec (rescans only when a spec changed)."""
+    specs = _scan_specs()
+    fingerprint = tuple(
+        (name, st.st_mtime_ns, st.st_size) for name, _, st in specs
+    )
+    if fingerprint == _SPEC_SCAN_CACHE["fingerprint"]:
+        return _SPEC_SCAN_CACHE["result"]
+    
+    result = (None, None)
+    for name, path, _ in specs:
         # Check if spec has a completion marker
-        if '<promise>DONE</promise>' not in content:
-            return name, path
-    return None, None
+        if not spec_is_done(path):
+            result = (name, path)
+            break
+    _SPEC_SCAN_CACHE["fingerprint"] = fingerprint
+    _SPEC_SCAN_CACHE["result"] = result
+    return result
 
-def run_iteration(iteration: int, max_iterations: int = 0) -> bool:
-    """Run one Ralph iteration. Returns True if DONE found."""
+def run_iteration(iteration: int, max_iterations: int = 0):
+    """Run one Ralph iteration. Returns the spec worked on, or None if all are done."""
     log(f"=== Iteration {iteration} ===")
     
     # Find work
     spec_name, spec_path = find_incomplete_spec()
     if not spec_path:
         log("No incomplete specs found!")
-        return True
+        return None
     
     log(f"Working on: {spec_name}")
     
@@ -71,42 +168,47 @@ def run_iteration(iteration: int, max_iterations: int = 0) -> bool:
     # Read constitution and prompt
     constitution_text = ""
     if CONSTITUTION.exists():
-        constitution_text = CONSTITUTION.read_text(encoding='utf-8')
+        constitution_text = cached_read(CONSTITUTION)
     
     prompt_text = ""
     if PROMPT_BUILD.exists():
-        prompt_text = PROMPT_BUILD.read_text(encoding='utf-8')
-    
-    spec_content = spec_path.read_text(encoding='utf-8')
-    
-    # Print instructions for the agent
-    log("=" * 60)
-    log("RALPH INSTRUCTIONS:")
-    log("=" * 60)
-    print("\n" + prompt_text)
-    print("\n" + "=" * 60)
-    log(f"CURRENT SPEC: {spec_name}")
-    log("=" * 60)
-    print("\n" + spec_content)
-    print("\n" + "=" * 60)
-    log("TASK:")
-    log("=" * 60)
-    print(f"""
+        prompt_text = cached_read(PROMPT_BUILD)
+    
+    spec_content = cached_read(spec_path)
+    
+    # Print instructions for the agent in one write (prompt and spec can be long)
+    rule = "=" * 60
+    sections = [
+        log_line(rule),
+        log_line("RALPH INSTRUCTIONS:"),
+        log_line(rule),
+        "\n" + prompt_text,
+        "\n" + rule,
+        log_line(f"CURRENT SPEC: {spec_name}"),
+        log_line(rule),
+        "\n" + spec_content,
+        "\n" + rule,
+        log_line("TASK:"),
+        log_line(rule),
+        f"""
 1. Implement the requirements in {spec_name}
 2. Run all tests
 3. Verify acceptance criteria
 4. Commit and push changes
-5. Add '<promise>DONE</promise>' to {spec_path} when complete
+5. Append '<promise>DONE</promise>' to the end of {spec_path} when complete
 
 DO NOT output 'DONE' until truly complete.
-""")
+""",
+    ]
+    sys.stdout.write("\n".join(sections) + "\n")
+    sys.stdout.flush()
     
     # In real Ralph, this would invoke the AI agent
     # For now, we just provide the context and wait
     log("Ready for implementation.")
-    log("Run your implementation, then add '<promise>DONE</promise>' to the spec file.")
+    log("Run your implementation, then append '<promise>DONE</promise>' to the end of the spec file.")
     
-    return False
+    return spec_path
 
 def main():
     """Main Ralph loop."""
@@ -114,12 +216,18 @@ def main():
     
     mode = "build"
     max_iterations = 0
+    watch = False
     
     for arg in args:
         if arg == "plan":
             mode = "plan"
-        elif arg.isdigit():
-            max_iterations = int(arg)
+        elif arg == "watch":
+            watch = True
+        else:
+            try:
+                max_iterations = int(arg)
+            except ValueError:
+                pass  # unknown arguments are ignored
     
     log(f"Ralph Loop starting - Mode: {mode}, Max iterations: {max_iterations or 'unlimited'}")
     
@@ -137,12 +245,17 @@ def main():
             break
         
         # Run one iteration
-        done = run_iteration(iteration, max_iterations)
+        spec_path = run_iteration(iteration, max_iterations)
         
-        if done:
+        if spec_path is None:
             log("All work complete!")
             break
         
+        if watch:
+            log(f"Waiting for '<promise>DONE</promise>' in {spec_path}...")
+            wait_for_spec_done(spec_path)
+            continue
+        
         # In autonomous mode, we would check for DONE marker
         # For manual mode, just run once
         log("Iteration complete. Check spec for '<promise>DONE</promise>' marker.")
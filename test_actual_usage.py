@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Test actual MERIDIAN Brain functionality."""
 
+from types import SimpleNamespace
+
 print("=== TESTING MERIDIAN BRAIN ===\n")
 
 # Test 1: Imports
@@ -16,8 +18,11 @@ except Exception as e:
 
 print("\n2. Testing ChunkStore...")
 try:
+    import atexit
+    import shutil
     import tempfile
     temp_dir = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, temp_dir, ignore_errors=True)
     store = ChunkStore(temp_dir)
     print(f"   [OK] ChunkStore created")
     
@@ -61,9 +66,7 @@ except Exception as e:
 
 print("\n4. Testing REPLSession...")
 try:
-    from unittest.mock import Mock
-    mock_llm = Mock()
-    mock_llm.complete = Mock(return_value="FINAL('test answer')")
+    mock_llm = SimpleNamespace(complete=lambda prompt: "FINAL('test answer')")
     
     repl = REPLSession(
         chunk_store=store,
@@ -100,7 +103,7 @@ except Exception as e:
 print("\n6. Testing retrieve workflow...")
 try:
     # This is the critical test - can we actually retrieve?
-    mock_llm.complete = Mock(return_value="FINAL('Found the test memory')")
+    mock_llm.complete = lambda prompt: "FINAL('Found the test memory')"
     
     result = repl.retrieve("What test memory do we have?")
     print(f"   [OK] retrieve returned: {result}")
@@ -10,30 +10,34 @@ print("\n[PART 1] BASIC MEMORY STORAGE")
 print("-"*40)
 
 from brain.scripts import ChunkStore, RememberOperation
+import atexit
+import shutil
 import tempfile
+from types import SimpleNamespace
 
 temp_dir = tempfile.mkdtemp()
+atexit.register(shutil.rmtree, temp_dir, ignore_errors=True)
 store = ChunkStore(temp_dir)
 print(f"[OK] ChunkStore initialized")
 
-# Store a preference
+# Store a preference and another memory in one batch
 remember = RememberOperation(store)
-result = remember.remember(
-    content="User prefers VS Code for Python development",
-    conversation_id="demo-conv-001",
-    tags=["preference", "editor", "python"],
-    confidence=0.95
-)
+result, result2 = remember.remember_many([
+    {
+        "content": "User prefers VS Code for Python development",
+        "conversation_id": "demo-conv-001",
+        "tags": ["preference", "editor", "python"],
+        "confidence": 0.95,
+    },
+    {
+        "content": "User likes dark mode for all applications",
+        "conversation_id": "demo-conv-001",
+        "tags": ["preference", "ui", "theme"],
+        "confidence": 0.90,
+    },
+])
 print(f"[OK] Stored memory: {result['success']}")
 print(f"     Created {result['chunks_created']} chunk(s)")
-
-# Store another memory
-result2 = remember.remember(
-    content="User likes dark mode for all applications",
-    conversation_id="demo-conv-001",
-    tags=["preference", "ui", "theme"],
-    confidence=0.90
-)
 print(f"[OK] Stored second memory")
 
 # Get stats
@@ -63,11 +67,9 @@ print("\n[PART 3] REPL SANDBOX")
 print("-"*40)
 
 from brain.scripts import REPLSession
-from unittest.mock import Mock
 
-# Create mock LLM that uses our stored memories
-mock_llm = Mock()
 
+# Create mock LLM that uses our stored memories
 def mock_complete(prompt):
     """Simulate LLM that searches for memories."""
     if "VS Code" in prompt or "editor" in prompt.lower():
@@ -77,7 +79,7 @@ def mock_complete(prompt):
     else:
         return "FINAL('I found some preference memories')"
 
-mock_llm.complete = mock_complete
+mock_llm = SimpleNamespace(complete=mock_complete)
 
 repl = REPLSession(
     chunk_store=store,